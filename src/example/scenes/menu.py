@@ -21,6 +21,11 @@ class Menu(Scene):
 
         self.font = pygame.Font(None, 50)
 
+        # Text is static, so rasterize it only once
+        self.text_surf = self.font.render("Welcome!", True, (255, 255, 255))
+        self.text_pos = (0.0, 0.0)
+        self.last_window_size = (0, 0)
+
     def deactivated(self, next_scene: str) -> None:
         print(f"Menu scene is deactivated. Next is {next_scene}.")
 
@@ -28,20 +33,26 @@ class Menu(Scene):
         print(f"Menu scene is active! Previous was {previous_scene}.")
 
     def update(self) -> None:
-        shared.app.window_title = f"Example app  -  fps: {round(shared.app.fps, 1)}"
+        app = shared.app
+
+        app.window_title = f"Example app  -  fps: {round(app.fps, 1)}"
 
-        if shared.app.input.key_pressed("escape"):
-            shared.app.stop()
+        if app.input.key_pressed("escape"):
+            app.stop()
 
-        if shared.app.input.key_pressed("space"):
-            shared.app.scene = "Game"
+        if app.input.key_pressed("space"):
+            app.scene = "Game"
 
     def render_before(self) -> None:
-        text_surf = self.font.render("Welcome!", True, (255, 255, 255))
-        shared.app.display.blit(
-            text_surf,
-            (
-                shared.app.window_width * 0.5 - text_surf.get_width() * 0.5,
-                shared.app.window_height * 0.5 - text_surf.get_height() * 0.5
+        app = shared.app
+
+        # Only re-center the text when the window is resized
+        window_size = (app.window_width, app.window_height)
+        if window_size != self.last_window_size:
+            self.last_window_size = window_size
+            self.text_pos = (
+                app.window_width * 0.5 - self.text_surf.get_width() * 0.5,
+                app.window_height * 0.5 - self.text_surf.get_height() * 0.5
             )
-        )
\ No newline at end of file
+
+        app.display.blit(self.text_surf, self.text_pos)
\ No newline at end of file
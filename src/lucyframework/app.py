@@ -11,17 +11,21 @@
 import asyncio
 import platform
 from pathlib import Path
+from bisect import bisect_right
 from time import time
 
 import pygame
-import miniprofiler
 
 from lucyframework.input import InputManager
 from lucyframework.scene import Scene
 from lucyframework.models import VSyncMode
+from lucyframework.profiler import Profiler
 from lucyframework.platform import is_web, get_cpu_info
 from lucyframework.path import resolve
-from lucyframework.common import DISPLAY_RESOLUTIONS
+from lucyframework.common import DISPLAY_RESOLUTIONS, DISPLAY_RESOLUTIONS_SET
+
+
+_INF = float("inf")
 
 
 class App:
@@ -34,6 +38,8 @@ class App:
         Targeted FPS cap
     dt_cap
         Maximum deltatime in seconds
+    event_types
+        Event types polled each frame, other events are discarded
     input
         Input manager
     monitor_width
@@ -48,6 +54,9 @@ class App:
         Current window vsync mode
     clear_color
         Current clear color
+    dirty_rect_mode
+        Only redraw and update the changed areas of the display each frame,
+        see `mark_dirty`. Not supported with OpenGL displays
     scenes
         A dictionary of scene names and scene instances
     profiler
@@ -81,6 +90,15 @@ class App:
 
         self.target_fps = target_fps
         self.dt_cap = 0.25
+        self.event_types = [
+            pygame.QUIT,
+            pygame.KEYDOWN,
+            pygame.KEYUP,
+            pygame.MOUSEBUTTONDOWN,
+            pygame.MOUSEBUTTONUP,
+            pygame.MOUSEWHEEL,
+            pygame.WINDOWMOVED
+        ]
 
         self._events: list[pygame.Event] = []
         self._fps = self.target_fps
@@ -95,21 +113,30 @@ class App:
         self.monitor_width = display_info.current_w
         self.monitor_height = display_info.current_h
 
+        # Monitor size doesn't change after initialization
+        self._usable_resolutions = self._calculate_usable_resolutions()
+
         self._window_title = ""
 
         self.vsync_mode = vsync_mode
         self.clear_color = clear_color
+        self.dirty_rect_mode = False
+        self._dirty_rects: list[pygame.Rect] = []
+        self._prev_dirty_rects: list[pygame.Rect] = []
+        self._full_redraw = True
         self.window_width, self.window_height = window_size
         self.create_window(opengl=opengl)
 
         self.scenes: dict[str, Scene] = {}
         self._current_scene = ""
+        self._current_scene_obj: Scene | None = None
 
-        self.profiler = miniprofiler.Profiler(target_fps)
+        # Roughly one second of timings, uncapped FPS falls back to 60 samples
+        self.profiler = Profiler(int(target_fps) or 60)
 
     @property
     def events(self) -> list[pygame.Event]:
-        """ Events polled in the current frame. """
+        """ Events polled in the current frame, see `event_types`. """
         return self._events
     
     @property
@@ -144,15 +171,28 @@ class App:
 
     @property
     def window_frect(self) -> pygame.FRect:
-        """ Window geometry as an FRect. """
-        pos = pygame.display.get_window_position()
-        return pygame.FRect(pos[0], pos[1], self.window_width, self.window_height)
+        """ Window geometry as an FRect, copy it before modifying. """
+
+        if self._window_frect is None:
+            self._update_window_geometry()
+
+        return self._window_frect
     
     @property
-    def window_rect(self) -> pygame.FRect:
-        """ Window geometry as a Rect. """
-        rect = self.window_frect
-        return pygame.Rect(rect.x, rect.y, rect.w, rect.h)
+    def window_rect(self) -> pygame.Rect:
+        """ Window geometry as a Rect, copy it before modifying. """
+
+        if self._window_rect is None:
+            self._update_window_geometry()
+
+        return self._window_rect
+
+    def _update_window_geometry(self) -> None:
+        """ Build the cached window rects, they are cleared when the window is moved or created. """
+
+        pos = pygame.display.get_window_position()
+        self._window_frect = pygame.FRect(pos[0], pos[1], self.window_width, self.window_height)
+        self._window_rect = pygame.Rect(self._window_frect)
 
     def create_window(self, opengl: bool = False) -> None:
         """
@@ -170,10 +210,14 @@ class App:
         
         self.display = pygame.display.set_mode(
             (self.window_width, self.window_height),
-            vsync=self.vsync_mode.value,
+            vsync=self.vsync_mode,
             flags=flags
         )
 
+        self._window_frect = None
+        self._window_rect = None
+        self._full_redraw = True
+
     @property
     def aspect_ratio(self) -> float:
         """ Current aspect ratio of the resolution. """
@@ -195,24 +239,33 @@ class App:
 
         monitor_tuple = (self.monitor_width, self.monitor_height)
 
-        if monitor_tuple in DISPLAY_RESOLUTIONS["16:9"]:
+        if monitor_tuple in DISPLAY_RESOLUTIONS_SET["16:9"]:
             return "16:9"
         
-        elif monitor_tuple in DISPLAY_RESOLUTIONS["4:3"]:
+        elif monitor_tuple in DISPLAY_RESOLUTIONS_SET["4:3"]:
             return "4:3"
 
     def get_usable_resolutions(self) -> dict:
         """ Get available resolutions for the current monitor. """
 
-        resolutions = {"16:9": [], "4:3": []}
+        return {
+            aspect_ratio: list(resolutions)
+            for aspect_ratio, resolutions in self._usable_resolutions.items()
+        }
+
+    def _calculate_usable_resolutions(self) -> dict:
+        """ Filter the display resolutions that fit in the monitor. """
+
+        resolutions = {}
 
-        for res in DISPLAY_RESOLUTIONS["16:9"]:
-            if res[0] <= self.monitor_width and res[1] <= self.monitor_height:
-                resolutions["16:9"].append(res)
+        # Tables grow on both axes, so the usable resolutions are a prefix
+        for aspect_ratio, table in DISPLAY_RESOLUTIONS.items():
+            cutoff = min(
+                bisect_right(table, self.monitor_width, key=lambda res: res[0]),
+                bisect_right(table, self.monitor_height, key=lambda res: res[1])
+            )
 
-        for res in DISPLAY_RESOLUTIONS["4:3"]:
-            if res[0] <= self.monitor_width and res[1] <= self.monitor_height:
-                resolutions["4:3"].append(res)
+            resolutions[aspect_ratio] = list(table[:cutoff])
 
         return resolutions
     
@@ -226,14 +279,12 @@ class App:
             Aspect ratio of the monitor, use `get_monitor_aspect_ratio`
         """
 
-        resolutions = self.get_usable_resolutions()
-
-        return resolutions[aspect_ratio][-1]
+        return self._usable_resolutions[aspect_ratio][-1]
 
     @property
     def scene(self) -> Scene:
         """ Current active scene. """
-        return self.scenes[self._current_scene]
+        return self._current_scene_obj
     
     @scene.setter
     def scene(self, scene_name: str) -> None:
@@ -242,8 +293,25 @@ class App:
             self.scenes[previous].deactivated(scene_name)
         
         self._current_scene = scene_name
-        self.scenes[self._current_scene].activated(previous)
+        self._current_scene_obj = self.scenes[scene_name]
+        self._current_scene_obj.activated(previous)
+        self._full_redraw = True
     
+    def mark_dirty(self, rect: pygame.typing.RectLike) -> None:
+        """
+        Mark an area of the display as changed in this frame.
+
+        Only used in `dirty_rect_mode`, areas marked in the previous frame are
+        cleared before rendering. Entities can also return the rect they drew
+        into from their render callback instead.
+
+        Parameters
+        ----------
+        rect
+            Changed area in pixels.
+        """
+        self._dirty_rects.append(pygame.Rect(rect))
+
     def add_scene(self, scene: Scene):
         """
         Add a scene to the application.
@@ -256,6 +324,9 @@ class App:
         scene_ = scene()
         self.scenes[scene_.__class__.__name__] = scene_
 
+        if scene_.__class__.__name__ == self._current_scene:
+            self._current_scene_obj = scene_
+
     def stop(self) -> None:
         """ Stop the application. """
         self._is_running = False
@@ -287,53 +358,120 @@ class App:
     def tick(self) -> None:
         """ One game frame. """
 
-        with self.profiler.profile("frame"):
+        profiler = self.profiler
+        clock = self._clock
+
+        with profiler.profile("frame"):
+
+            self._dt = min(clock.tick(self.target_fps) * 0.001, self.dt_cap)
 
-            self._dt = self._clock.tick(self.target_fps) * 0.001
-            self._dt = min(self._dt, self.dt_cap)
+            # Poll right after the clock sleeps so that frame logic sees the
+            # freshest input possible
+            self._poll_events()
 
-            self._fps = self._clock.get_fps()
+            fps = clock.get_fps()
             # Prevent OverflowError for rendering
-            if self._fps == float("inf"): self._fps = 0
+            self._fps = 0 if fps == _INF else fps
 
             self._time = time() - self._start_time
 
-            with self.profiler.profile("update"):
+            with profiler.profile("update"):
                 self._update()
 
-            with self.profiler.profile("render"):
+            with profiler.profile("render"):
                 self._render()
 
-    def _update(self) -> None:
-        """ Update the game frame. """
+    def _poll_events(self) -> None:
+        """ Poll events and update input states. """
+
+        # Only build event objects for the types we care about, rest of the
+        # queue (mostly mouse motion spam) is flushed without a second pump
+        events = pygame.event.get(self.event_types)
+        pygame.event.clear(pump=False)
+        self._events = events
 
-        self._events = pygame.event.get()
+        quit_type = pygame.QUIT
+        moved_type = pygame.WINDOWMOVED
+        for event in events:
+            event_type = event.type
 
-        for event in self._events:
-            if event.type == pygame.QUIT:
+            if event_type == quit_type:
                 self.stop()
 
-        self.input.update(self.events)
+            elif event_type == moved_type:
+                self._window_frect = None
+                self._window_rect = None
 
-        self.scene.update()
+        self.input.update(events)
 
-        for entity in self.scene.entities:
-            entity.update()
+    def _update(self) -> None:
+        """ Update the game frame. """
+
+        scene = self._current_scene_obj
+        scene.update()
+
+        scene.update_entities()
 
     def _render(self) -> None:
         """ Render the game frame. """
 
-        self.display.fill(self.clear_color)
+        if self.dirty_rect_mode and not self._full_redraw:
+            self._render_dirty()
+            return
 
-        self.scene.render_before()
+        self._full_redraw = False
+        dirty_rects = self._dirty_rects
 
-        for entity in self.scene.entities:
-            entity.render()
+        self.display.fill(self.clear_color)
 
-        self.scene.render_after()
+        scene = self._current_scene_obj
+        scene.render_before()
+        self._render_entities(scene, dirty_rects)
+        scene.render_after()
 
         pygame.display.flip()
 
+        # Keep track of the drawn areas in case dirty rect mode is enabled later
+        self._prev_dirty_rects = dirty_rects
+        self._dirty_rects = []
+
+    def _render_dirty(self) -> None:
+        """ Render the game frame only updating the changed areas. """
+
+        display = self.display
+        clear_color = self.clear_color
+        dirty_rects = self._dirty_rects
+
+        # Erase what was drawn in the previous frame
+        for rect in self._prev_dirty_rects:
+            display.fill(clear_color, rect)
+
+        scene = self._current_scene_obj
+        scene.render_before()
+        self._render_entities(scene, dirty_rects)
+        scene.render_after()
+
+        # Both the erased and newly drawn areas need to reach the screen
+        pygame.display.update(self._prev_dirty_rects + dirty_rects)
+
+        self._prev_dirty_rects = dirty_rects
+        self._dirty_rects = []
+
+    def _render_entities(self, scene: Scene, dirty_rects: list[pygame.Rect]) -> None:
+        """ Render opaque entities and then transparent ones in z order. """
+
+        scene.prepare_render()
+
+        for entity in scene.entities_opaque:
+            rect = entity.render()
+            if rect is not None:
+                dirty_rects.append(rect)
+
+        for entity in scene.entities_transparent:
+            rect = entity.render()
+            if rect is not None:
+                dirty_rects.append(rect)
+
     @staticmethod
     def get_version_info() -> dict[str, str]:
         """
@@ -9,6 +9,7 @@
 """
 
 # Commmon display resolutions up to 4K
+# Keep each table sorted from smallest to largest on both axes
 DISPLAY_RESOLUTIONS = {
     "16:9": (
         (768, 432),
@@ -32,6 +33,12 @@ DISPLAY_RESOLUTIONS = {
     )
 }
 
+# Same resolutions as sets for fast membership checks
+DISPLAY_RESOLUTIONS_SET = {
+    aspect_ratio: frozenset(resolutions)
+    for aspect_ratio, resolutions in DISPLAY_RESOLUTIONS.items()
+}
+
 # Common refresh rates of monitors
 FPS_CAPS = (
     25,
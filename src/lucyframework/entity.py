@@ -11,6 +11,7 @@
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
+    import pygame
     from lucyframework.scene import Scene
 
 
@@ -19,8 +20,21 @@ class Entity:
     Base entity class.
 
     Entity is the simplest game object updated and rendered each frame in a scene.
+
+    Attributes
+    ----------
+    scene
+        Scene the entity belongs to
+    transparent
+        Is the entity rendered with transparency? Transparent entities are
+        rendered after opaque ones, set this before initialization
+    z
+        Render order of transparent entities, higher is drawn on top
     """
 
+    transparent = False
+    z = 0.0
+
     def __init__(self, scene: "Scene") -> None:
         """
         Parameters
@@ -43,10 +57,13 @@ class Entity:
         """
         ...
 
-    def render(self) -> None:
+    def render(self) -> "pygame.Rect | None":
         """
         Entity render callback.
         
         You can implement this method in your subclass.
+
+        When the app is in dirty rect mode, return the area drawn into so that
+        it gets updated on the display.
         """
         ...
\ No newline at end of file
@@ -78,16 +78,19 @@ class Game(lucyfw.Scene):
 
         self.font = pygame.Font(None, 35)
 
+        # Text is static, so rasterize it only once
+        self.text_surf = self.font.render(
+            "There supposed to be a game here.",
+            True,
+            (255, 255, 255)
+        )
+
     def update(self) -> None:
         if shared.app.input.key_pressed("escape"):
             shared.app.stop()
 
     def render_before(self) -> None:
-        text_surf = self.font.render(
-            "There supposed to be a game here.",
-            True,
-            (255, 255, 255)
-        )
+        text_surf = self.text_surf
         shared.app.display.blit(
             text_surf,
             (
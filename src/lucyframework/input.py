@@ -15,6 +15,9 @@ class InputManager:
     """
     Input manager class.
 
+    Keyboard states are read from SDL's keyboard state each frame, so key
+    events posted with `pygame.event.post` are not registered as key presses.
+
     Attributes
     ----------
     mouse
@@ -26,8 +29,12 @@ class InputManager:
     """
 
     def __init__(self) -> None:
+        # Keyboard state snapshots, indexed by key codes
+        self.__keys_held = pygame.key.get_pressed()
+        self.__keys_pressed = pygame.key.get_just_pressed()
+        self.__keys_released = pygame.key.get_just_released()
+
         #                          held pressed released
-        self.__key_states = {k:   [0,   0,      0       ] for k in KEY_MAPPING}
         self.__mouse_states = {b: [0,   0,      0       ] for b in MOUSE_MAPPING}
 
         self.mouse = pygame.Vector2(0)
@@ -52,26 +59,19 @@ class InputManager:
         self.mouse = pygame.Vector2(*pygame.mouse.get_pos())
         self.mouse_rel = pygame.Vector2(*pygame.mouse.get_rel())
 
-        # Reset pressed and released states
-        for k in self.__key_states:
-            self.__key_states[k][1] = 0
-            self.__key_states[k][2] = 0
+        # SDL already tracks the keyboard state, take one snapshot per frame
+        # instead of replaying key events
+        self.__keys_held = pygame.key.get_pressed()
+        self.__keys_pressed = pygame.key.get_just_pressed()
+        self.__keys_released = pygame.key.get_just_released()
 
+        # Reset pressed and released states
         for b in self.__mouse_states:
             self.__mouse_states[b][1] = 0
             self.__mouse_states[b][2] = 0
 
         for event in events:
-            if event.type == pygame.KEYDOWN:
-                self.__key_states[_KEY_INVDICT[event.key]][0] = 1
-                self.__key_states[_KEY_INVDICT[event.key]][1] = 1
-
-            elif event.type == pygame.KEYUP:
-                self.__key_states[_KEY_INVDICT[event.key]][0] = 0
-                self.__key_states[_KEY_INVDICT[event.key]][1] = 0
-                self.__key_states[_KEY_INVDICT[event.key]][2] = 1
-
-            elif event.type == pygame.MOUSEBUTTONDOWN:
+            if event.type == pygame.MOUSEBUTTONDOWN:
                 self.__mouse_states[_MOUSE_INVDICT[event.button]][0] = 1
                 self.__mouse_states[_MOUSE_INVDICT[event.button]][1] = 1
 
@@ -87,16 +87,16 @@ class InputManager:
                     self.__mouse_states["wheeldown"][1] = True
 
     def key_pressed(self, key: str) -> bool:
-        """ Check if key is just pressed. """
-        return self.__key_states[key.lower()][1]
+        """ Check if key is just pressed, posted key events are not registered. """
+        return self.__keys_pressed[KEY_MAPPING[key.lower()]]
 
     def key_released(self, key: str) -> bool:
-        """ Check if key is just released. """
-        return self.__key_states[key.lower()][2]
+        """ Check if key is just released, posted key events are not registered. """
+        return self.__keys_released[KEY_MAPPING[key.lower()]]
 
     def key_held(self, key: str) -> bool:
-        """ Check if key is currently pressed. """
-        return self.__key_states[key.lower()][0]
+        """ Check if key is currently pressed, posted key events are not registered. """
+        return self.__keys_held[KEY_MAPPING[key.lower()]]
 
     def mouse_pressed(self, button: str) -> bool:
         """ Check if mouse button is just pressed. """
@@ -300,6 +300,5 @@ MOUSE_MAPPING= {
     "extra6": 11
 }
 
-# Inverted mappings used by input manager
-_KEY_INVDICT = {v: k for k, v in KEY_MAPPING.items()}
+# Inverted mapping used by input manager
 _MOUSE_INVDICT = {v: k for k, v in MOUSE_MAPPING.items()}
\ No newline at end of file
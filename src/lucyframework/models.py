@@ -8,10 +8,10 @@
 
 """
 
-from enum import Enum
+from enum import IntEnum
 
 
-class VSyncMode(Enum):
+class VSyncMode(IntEnum):
     """
     Vertical sync enum.
 
@@ -11,15 +11,27 @@
 import sys
 import os
 from pathlib import Path
+from functools import lru_cache
+
+
+# Freezer base directory doesn't change during runtime, so it's resolved once
+if getattr(sys, "frozen", False):
+    _FROZEN_BASE = sys._MEIPASS
+
+else:
+    _FROZEN_BASE = None
 
 
 def resolve(*children: str) -> Path:
     """ Resolve path in the base directory regardless of freezer. """
 
-    if getattr(sys, "frozen", False):
-        base = sys._MEIPASS
+    # Working directory is still queried each call in case it has changed
+    base = _FROZEN_BASE or os.getcwd()
+
+    return _join(base, *children)
 
-    else:
-        base = os.getcwd()
 
-    return (Path(base) / Path(*children)).resolve()
\ No newline at end of file
+@lru_cache(maxsize=512)
+def _join(base: str, *children: str) -> Path:
+    """ Join and normalize path without touching the filesystem. """
+    return Path(os.path.normpath(os.path.join(base, *children)))
\ No newline at end of file
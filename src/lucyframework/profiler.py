@@ -0,0 +1,156 @@
+"""
+    
+    Toy, personal framework built on Pygame.
+
+    This file is a part of the lucyframework
+    project and distributed under MIT license.
+    https://github.com/kadir014/lucyframework
+
+"""
+
+from typing import NamedTuple
+from collections import deque
+from time import perf_counter
+
+
+class ProfiledStat(NamedTuple):
+    """
+    Profiled timings of a single stat over the accumulated window.
+
+    Attributes
+    ----------
+    avg
+        Average timing in seconds
+    min
+        Minimum timing in seconds
+    max
+        Maximum timing in seconds
+    """
+
+    avg: float
+    min: float
+    max: float
+
+
+class _Scope:
+    """
+    Reusable context timing a single stat.
+
+    One scope is created per stat, so the same stat can't be profiled in
+    nested contexts.
+    """
+
+    __slots__ = ("profiler", "stat", "start")
+
+    def __init__(self, profiler: "Profiler", stat: str) -> None:
+        self.profiler = profiler
+        self.stat = stat
+        self.start = 0.0
+
+    def __enter__(self) -> None:
+        self.start = perf_counter()
+
+    def __exit__(self, *args) -> None:
+        self.profiler.accumulate(self.stat, perf_counter() - self.start)
+
+
+class Profiler:
+    """
+    Lightweight frame profiler.
+
+    Timings are accumulated in a fixed size window and averaged.
+
+    Attributes
+    ----------
+    accumulate_limit
+        Number of recent timings kept for each stat
+    """
+
+    def __init__(self, accumulate_limit: int = 60) -> None:
+        """
+        Parameters
+        ----------
+        accumulate_limit
+            Number of recent timings kept for each stat.
+        """
+
+        self.accumulate_limit = accumulate_limit
+
+        self.__timings = {}
+        self.__scopes = {}
+
+    def __getitem__(self, stat: str) -> ProfiledStat:
+        """ Get the profiled timings of a stat. """
+
+        timing = self.__timings[stat]
+        acc = timing["acc"]
+
+        # Extremes are only needed when read, so they are not tracked per sample
+        if len(acc) == 0:
+            return ProfiledStat(0.0, 0.0, 0.0)
+
+        return ProfiledStat(timing["avg"], min(acc), max(acc))
+
+    def get_avg(self, stat: str) -> float:
+        """ Get the average timing of a stat without building a summary. """
+        return self.__timings[stat]["avg"]
+
+    def register(self, stat: str) -> None:
+        """
+        Register a new stat to profile.
+
+        Parameters
+        ----------
+        stat
+            Name of the stat.
+        """
+
+        self.__timings[stat] = {
+            "avg": 0.0,
+            "acc": deque(maxlen=max(self.accumulate_limit, 1)),
+            "sum": 0.0
+        }
+
+        self.__scopes[stat] = _Scope(self, stat)
+
+    def accumulate(self, stat: str, value: float) -> None:
+        """
+        Accumulate a timing.
+
+        Parameters
+        ----------
+        stat
+            Name of the stat.
+        value
+            Timing in seconds.
+        """
+
+        if stat not in self.__timings:
+            self.register(stat)
+
+        timing = self.__timings[stat]
+        acc = timing["acc"]
+
+        # Deque drops the oldest timing by itself, keep the running sum in sync
+        if len(acc) == acc.maxlen:
+            timing["sum"] -= acc[0]
+
+        acc.append(value)
+        timing["sum"] += value
+
+        timing["avg"] = timing["sum"] / len(acc)
+
+    def profile(self, stat: str) -> _Scope:
+        """
+        Profile the code block in the context.
+
+        Parameters
+        ----------
+        stat
+            Name of the stat.
+        """
+
+        if stat not in self.__scopes:
+            self.register(stat)
+
+        return self.__scopes[stat]
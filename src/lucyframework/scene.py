@@ -21,20 +21,163 @@ class Scene:
     Base scene class.
 
     A scene is a basic state managing all entities.
+
+    Attributes
+    ----------
+    camera
+        Camera position
+    entities
+        All entities in the scene, in update order
+    entities_opaque
+        Opaque entities, rendered first
+    entities_transparent
+        Transparent entities, rendered after opaque ones sorted by their z
+
+    Removed entities are taken out of the render lists lazily, call
+    `prepare_render` before iterating them yourself.
     """
 
     def __init__(self) -> None:
         self.camera = pygame.Vector2(0)
 
-        self.entities = set()
+        self.entities: list["Entity"] = []
+        self.entities_opaque: list["Entity"] = []
+        self.entities_transparent: list["Entity"] = []
+        self._transparent_dirty = False
+        self._render_removed: set["Entity"] = set()
+
+        # Entities killed while the entities are being updated, they are
+        # removed once the update loop is over
+        self._updating = False
+        self._pending_removals: set["Entity"] = set()
 
     def add_entity(self, entity: "Entity") -> None:
-        """ Add entity to the scene. """
-        self.entities.add(entity)
+        """ Add entity to the scene, adding an entity already in the scene does nothing. """
+
+        # Added back before its deferred removal took place
+        if entity in self._pending_removals:
+            self._pending_removals.discard(entity)
+            return
+
+        if self._has_entity(entity):
+            return
+
+        # Its old render list entry is still there, drop it before adding again
+        if entity in self._render_removed:
+            self._compact_render_lists()
+
+        entity._scene_index = len(self.entities)
+        self.entities.append(entity)
+
+        # Partition for rendering once here rather than each frame, the list
+        # is remembered in case the flag changes until removal
+        entity._scene_transparent = entity.transparent
+
+        if entity.transparent:
+            self.entities_transparent.append(entity)
+            self._transparent_dirty = True
+
+        else:
+            self.entities_opaque.append(entity)
 
     def remove_entity(self, entity: "Entity") -> None:
-        """ Remove entity from the scene. """
-        self.entities.remove(entity)
+        """
+        Remove entity from the scene.
+        
+        Order of the remaining entities is not preserved. If this is called
+        while entities are being updated, the entity is removed after all of
+        them are updated.
+        """
+
+        if not self._has_entity(entity) or entity in self._pending_removals:
+            raise ValueError("Entity is not in the scene.")
+
+        if self._updating:
+            self._pending_removals.add(entity)
+            return
+
+        entities = self.entities
+        index = entity._scene_index
+
+        # Swap the last entity into the freed slot instead of shifting the list
+        last = entities.pop()
+        if last is not entity:
+            entities[index] = last
+            last._scene_index = index
+
+        entity._scene_index = -1
+
+        # Render lists keep their order, so they are compacted once before the
+        # next render rather than shifted on each removal
+        self._render_removed.add(entity)
+
+    def _has_entity(self, entity: "Entity") -> bool:
+        """ Check if the entity is in the entities list. """
+
+        index = getattr(entity, "_scene_index", -1)
+        return 0 <= index < len(self.entities) and self.entities[index] is entity
+
+    def update_entities(self) -> None:
+        """
+        Update all entities in the scene.
+
+        Entities removed meanwhile are not updated anymore, and only taken
+        out of the list after the loop, so none of them get skipped.
+        """
+
+        pending = self._pending_removals
+        self._updating = True
+
+        try:
+            for entity in self.entities:
+                if pending and entity in pending:
+                    continue
+
+                entity.update()
+
+        finally:
+            self._updating = False
+
+        # Remove one by one, entities may be added back while iterating
+        while pending:
+            self.remove_entity(pending.pop())
+
+    def _compact_render_lists(self) -> None:
+        """ Take the removed entities out of the render lists. """
+
+        removed = self._render_removed
+
+        if any(entity._scene_transparent for entity in removed):
+            self.entities_transparent = [
+                entity for entity in self.entities_transparent if entity not in removed
+            ]
+
+        if not all(entity._scene_transparent for entity in removed):
+            self.entities_opaque = [
+                entity for entity in self.entities_opaque if entity not in removed
+            ]
+
+        removed.clear()
+
+    def prepare_render(self) -> None:
+        """ Bring the render lists up to date, this is called before rendering entities. """
+
+        if self._render_removed:
+            self._compact_render_lists()
+
+        if self._transparent_dirty:
+            self.sort_transparent()
+
+    def sort_transparent(self) -> None:
+        """
+        Sort transparent entities by their z, higher z is drawn on top.
+
+        This is done automatically when a transparent entity is added, call
+        it if you change the z of an entity afterwards.
+        """
+
+        self.entities_transparent.sort(key=lambda entity: entity.z)
+        self._transparent_dirty = False
 
     def activated(self, previous_scene: str) -> None:
         """
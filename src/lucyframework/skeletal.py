@@ -11,14 +11,15 @@
 from typing import Optional
 from collections.abc import Iterator
 
-from dataclasses import dataclass
-from time import perf_counter
-from math import pi, cos, fmod
+from dataclasses import dataclass, field
+from bisect import bisect_right
+from time import perf_counter_ns
+from math import pi, cos, sin, radians
 
 import pygame
 
 
-@dataclass
+@dataclass(slots=True)
 class CoreTransform:
     """
     Core world transform of the skeletal system.
@@ -29,7 +30,7 @@ class CoreTransform:
     scale: float = 1.0
 
 
-@dataclass
+@dataclass(slots=True)
 class Bone:
     """
     Bone structure.
@@ -43,58 +44,115 @@ class Bone:
     local_angle: float
     local_angle_saved: float = 0.0
 
+    # World transform cache, valid as long as the generation matches skeleton's
+    _skeleton: Optional["SkeletalAnimation"] = field(default=None, init=False, repr=False, compare=False)
+    _core: Optional[CoreTransform] = field(default=None, init=False, repr=False, compare=False)
+    _cache_gen: int = field(default=-1, init=False, repr=False, compare=False)
+    _world_angle: float = field(default=0.0, init=False, repr=False, compare=False)
+    _start_x: float = field(default=0.0, init=False, repr=False, compare=False)
+    _start_y: float = field(default=0.0, init=False, repr=False, compare=False)
+    _end_x: float = field(default=0.0, init=False, repr=False, compare=False)
+    _end_y: float = field(default=0.0, init=False, repr=False, compare=False)
+
+    def _refresh(self) -> None:
+        """ Recalculate the cached world transforms if they're outdated. """
+
+        if self._cache_gen != self._skeleton._gen:
+            self._skeleton._update_world_transforms()
+
     @property
     def start(self) -> pygame.Vector2:
         """ Start position of the bone in world space. """
-        
-        if isinstance(self.parent, Bone):
-            return self.parent.end
-        
-        elif isinstance(self.parent, CoreTransform):
-            return self.parent.position
+
+        self._refresh()
+        return pygame.Vector2(self._start_x, self._start_y)
 
     @property
     def end(self) -> pygame.Vector2:
         """ End position of the bone in world space. """
-        return self.start + pygame.Vector2(self.length, 0.0).rotate(self.angle)
+
+        return pygame.Vector2(self.end_xy())
     
     @property
     def center(self) -> pygame.Vector2:
         """ Center position of the bone in world space. """
-        return self.start + pygame.Vector2(self.length * 0.5, 0.0).rotate(self.angle)
+
+        self._refresh()
+        return pygame.Vector2(
+            (self._start_x + self._end_x) * 0.5,
+            (self._start_y + self._end_y) * 0.5
+        )
+
+    def end_xy(self) -> tuple[float, float]:
+        """ End position of the bone in world space as a tuple. """
+
+        self._refresh()
+        return (self._end_x, self._end_y)
     
     @property
     def length(self) -> float:
         """ Length of the bone scaled to world space. """
 
-        return self.local_length * self._gather_core_scale()
+        return self.local_length * self._core.scale
     
     @property
     def angle(self) -> float:
         """ Angle of the bone transformed to world space. """
-        return self.local_angle + self.parent.angle
-    
-    def _gather_core_scale(self) -> float:
-        if isinstance(self.parent, Bone):
-            return self.parent._gather_core_scale()
-
-        elif isinstance(self.parent, CoreTransform):
-            return self.parent.scale
 
+        self._refresh()
+        return self._world_angle
 
-@dataclass
-class BoneAnimationKeyframe:
-    time: float
-    angle: Optional[float]
-    length: Optional[float]
 
-@dataclass
+@dataclass(slots=True)
 class BoneAnimation:
+    """
+    Keyframe track of a single bone.
+
+    Keyframe fields are stored as separate tuples, index i of each is the
+    i-th keyframe.
+    """
+
     bone: Bone
-    keyframes: list[BoneAnimationKeyframe]
+    times: tuple[float, ...]
+    angles: tuple[Optional[float], ...]
+    lengths: tuple[Optional[float], ...]
+
+    # Per segment (between keyframe i and i+1) constants
+    inv_durations: list[float] = field(init=False, repr=False)
+    base_angles: list[Optional[float]] = field(init=False, repr=False)
+    delta_angles: list[Optional[float]] = field(init=False, repr=False)
+    has_all_angles: bool = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.build_segments()
+
+    def build_segments(self) -> None:
+        """ Precalculate segment constants, call after changing the keyframes. """
 
+        times = self.times
+        angles = self.angles
 
-EASE_IN_OUT_SINE = lambda x: -(cos(x * pi) - 1) / 2
+        self.inv_durations = [
+            1.0 / (end - start) if end - start > 0.0 else 0.0
+            for start, end in zip(times, times[1:])
+        ]
+
+        self.base_angles = list(angles[:-1])
+
+        # Shortest path difference, so lerp_angle is not needed when sampling
+        self.delta_angles = [
+            None if a is None or b is None else (b - a + 180) % 360 - 180
+            for a, b in zip(angles, angles[1:])
+        ]
+
+        # Most tracks key the angle on every keyframe, they can be sampled
+        # without checking for gaps
+        self.has_all_angles = None not in self.delta_angles
+
+
+# Same as -(cos(x * pi) - 1) / 2 with fewer operations, a lookup table was
+# tried here but indexing and lerping it in Python is slower than one cos call
+EASE_IN_OUT_SINE = lambda x: 0.5 - 0.5 * cos(x * pi)
 
 def lerp_angle(a: float, b: float, t: float) -> float:
     """
@@ -105,9 +163,85 @@ def lerp_angle(a: float, b: float, t: float) -> float:
     return a + diff * t
 
 
+# Pose evaluation is kept in plain functions over the keyframe tracks, so the
+# per bone loops only touch locals
+
+def _evaluate_pose(animation: list[BoneAnimation], t: float, sign: float) -> None:
+    """ Write the local angles of animated bones at time t, all segments must have angles. """
+
+    ease = EASE_IN_OUT_SINE
+
+    for bone_animation in animation:
+        times = bone_animation.times
+
+        # Clamp to the first and last segments when time is out of range
+        i = bisect_right(times, t) - 1
+        last = len(times) - 2
+        if i < 0:
+            i = 0
+        elif i > last:
+            i = last
+
+        alpha = (t - times[i]) * bone_animation.inv_durations[i]
+        bone_animation.bone.local_angle = (bone_animation.base_angles[i] + bone_animation.delta_angles[i] * ease(alpha)) * sign
+
+def _evaluate_partial_pose(animation: list[BoneAnimation], t: float, sign: float) -> None:
+    """ Write the local angles of animated bones at time t, skipping segments without angles. """
+
+    ease = EASE_IN_OUT_SINE
+
+    for bone_animation in animation:
+        times = bone_animation.times
+
+        i = bisect_right(times, t) - 1
+        last = len(times) - 2
+        if i < 0:
+            i = 0
+        elif i > last:
+            i = last
+
+        delta = bone_animation.delta_angles[i]
+
+        if delta is not None:
+            alpha = (t - times[i]) * bone_animation.inv_durations[i]
+            bone_animation.bone.local_angle = (bone_animation.base_angles[i] + delta * ease(alpha)) * sign
+
+def _evaluate_transition_pose(
+        animation: list[BoneAnimation],
+        t: float,
+        blend: float,
+        sign: float
+        ) -> None:
+    """ Blend the saved local angles of bones towards the animation pose at time t. """
+
+    ease = EASE_IN_OUT_SINE
+
+    for bone_animation in animation:
+        bone = bone_animation.bone
+        times = bone_animation.times
+
+        i = bisect_right(times, t) - 1
+        last = len(times) - 2
+        if i < 0:
+            i = 0
+        elif i > last:
+            i = last
+
+        alpha = ease((t - times[i]) * bone_animation.inv_durations[i])
+        angle = (bone_animation.base_angles[i] + bone_animation.delta_angles[i] * alpha) * sign
+
+        # Same as lerp_angle, inlined to save a call per bone
+        saved = bone.local_angle_saved
+        bone.local_angle = saved + ((angle - saved + 180) % 360 - 180) * blend
+
+
 class SkeletalAnimation:
     """
-    TODO
+    Skeleton of bones animated by keyframes.
+
+    World transforms of bones are cached and recalculated lazily. They are
+    invalidated on each `update`, call `invalidate` if you change bones or
+    the core transform in between.
     """
 
     def __init__(self, skeleton_data: dict, animations_data: dict) -> None:
@@ -124,6 +258,9 @@ class SkeletalAnimation:
 
         self.bones: dict[str, Bone] = {}
 
+        # Bumped whenever bone world transforms need to be recalculated
+        self._gen = 0
+
         for bone_name in skeleton_data:
             bone_data = skeleton_data[bone_name]
 
@@ -135,13 +272,17 @@ class SkeletalAnimation:
                     bone_data["angle"]
                 )
             )
+            # Direct references so bones don't have to climb the hierarchy
+            self.bones[bone_name]._skeleton = self
+            self.bones[bone_name]._core = self.core
 
         # Fill the parents with actual Bone data
         for bone_name in self.bones:
             bone = self.bones[bone_name]
 
+            # Bone positions are only defined relative to the core
             if bone.parent is None:
-                continue
+                raise ValueError(f"Bone '{bone_name}' has no parent, use \"core\" for root bones.")
 
             elif bone.parent == "core":
                 bone.parent = self.core
@@ -149,6 +290,26 @@ class SkeletalAnimation:
             else:
                 bone.parent = self.bones[bone.parent]
 
+        # Bones ordered so that each parent comes before its children, this is
+        # resolved once here so that hierarchy passes can go in a single loop
+        self._bone_order: list[Bone] = []
+        visited = set()
+
+        for bone in self.bones.values():
+            chain = []
+
+            while isinstance(bone, Bone) and bone.name not in visited:
+                visited.add(bone.name)
+                chain.append(bone)
+                bone = bone.parent
+
+            self._bone_order.extend(reversed(chain))
+
+        # Parent kinds are resolved here too, so the transform pass doesn't
+        # have to branch on them per bone
+        self._root_bones = [bone for bone in self._bone_order if bone.parent is self.core]
+        self._child_bones = [bone for bone in self._bone_order if bone.parent is not self.core]
+
         self.animations: dict[str, list[BoneAnimation]] = {}
 
         for animation_name in animations_data:
@@ -157,30 +318,26 @@ class SkeletalAnimation:
 
             for bone_name in animation_data:
                 bone = self.bones[bone_name]
-
-                keyframes = []
-                for keyframe_data in animation_data[bone_name]:
-                    keyframes.append(
-                        BoneAnimationKeyframe(
-                            keyframe_data["time"],
-                            keyframe_data.get("angle"),
-                            keyframe_data.get("length")
-                        )
-                    )
+                keyframes_data = animation_data[bone_name]
 
                 self.animations[animation_name].append(
                     BoneAnimation(
                         bone,
-                        keyframes
+                        tuple(keyframe["time"] for keyframe in keyframes_data),
+                        tuple(keyframe.get("angle") for keyframe in keyframes_data),
+                        tuple(keyframe.get("length") for keyframe in keyframes_data)
                     )
                 )
 
         self.is_started = False
         self.current_animation = ""
+        self._animation: list[BoneAnimation] = []
+        self._evaluate_animation = _evaluate_pose
         self.duration = 0.0
         self.transition_duration = 0.2
-        self.__start_time = 0.0
-        self.__transition_start_time = 0.0
+        # Start times are integer nanoseconds from perf_counter_ns
+        self.__start_time = 0
+        self.__transition_start_time = 0
         self.is_looping = False
         self.reverse_on_each_loop = False
         self.reverse = False
@@ -190,6 +347,7 @@ class SkeletalAnimation:
         self.time_scale = 1.0
 
         self.__flipped = False
+        self._flip_sign = 1.0
 
     @property
     def flipped(self) -> bool:
@@ -205,23 +363,65 @@ class SkeletalAnimation:
 
     def _flip(self) -> None:
         self.core.angle = 180 - self.core.angle
+        self.invalidate()
 
-        for bone_name, bone in self.iter_bones():
+        for bone in self._bone_order:
            bone.local_angle = 0 - bone.local_angle
            bone.local_angle_saved = bone.local_angle
 
-        for animation in self.animations:
-            for bone_animation in self.animations[animation]:
-                for keyframe in bone_animation.keyframes:
-                    keyframe.angle = 0 - keyframe.angle
+        # Keyframe tracks are left untouched, animated angles are mirrored
+        # by this sign when they are evaluated
+        self._flip_sign = -1.0 if self.__flipped else 1.0
     
+    def invalidate(self) -> None:
+        """ Mark cached world transforms of bones as outdated. """
+        self._gen += 1
+
+    def _update_world_transforms(self) -> None:
+        """ Calculate world transforms of all bones in one hierarchy pass. """
+
+        generation = self._gen
+        core = self.core
+        core_x, core_y = core.position
+        scale = core.scale
+
+        angle = core.angle
+
+        for bone in self._root_bones:
+            bone_angle = bone.local_angle + angle
+            angle_rad = radians(bone_angle)
+            length = bone.local_length * scale
+
+            bone._cache_gen = generation
+            bone._world_angle = bone_angle
+            bone._start_x = core_x
+            bone._start_y = core_y
+            bone._end_x = core_x + cos(angle_rad) * length
+            bone._end_y = core_y + sin(angle_rad) * length
+
+        # Parents are always visited before their children, so their cached
+        # transforms are already up to date when read here
+        for bone in self._child_bones:
+            parent = bone.parent
+            bone_angle = bone.local_angle + parent._world_angle
+            angle_rad = radians(bone_angle)
+            length = bone.local_length * scale
+            start_x = parent._end_x
+            start_y = parent._end_y
+
+            bone._cache_gen = generation
+            bone._world_angle = bone_angle
+            bone._start_x = start_x
+            bone._start_y = start_y
+            bone._end_x = start_x + cos(angle_rad) * length
+            bone._end_y = start_y + sin(angle_rad) * length
+
     def iter_bones(self) -> Iterator[tuple[str, Bone]]:
         """ Iterate over bones. """
 
-        for bone_name in self.bones:
-            bone = self.bones[bone_name]
-
-            yield (bone_name, bone)
+        # Dict items iterator runs in C, instead of a generator frame resumed
+        # and a name lookup per bone
+        return iter(self.bones.items())
 
     def play(self,
             animation: str,
@@ -256,24 +456,30 @@ class SkeletalAnimation:
         if not self.is_started or force or transition:
             self.is_started = True
             self.transition = transition
+            now = perf_counter_ns()
             self.old_start_time = self.__start_time
-            self.transition_t = (perf_counter() - self.old_start_time)
+            self.transition_t = (now - self.old_start_time) * 1e-9
             self.old_time_scale = self.time_scale
             self.transition_reverse = self.reverse
             self.old_duration = self.duration
             if transition:
-                self.__transition_start_time = perf_counter()
+                self.__transition_start_time = now
             else:
-                self.__start_time = perf_counter()
+                self.__start_time = now
             self.is_looping = loop
             self.previous_animation = self.current_animation
             self.current_animation = animation
+            self._animation = self.animations[animation]
+            if all(bone_animation.has_all_angles for bone_animation in self._animation):
+                self._evaluate_animation = _evaluate_pose
+            else:
+                self._evaluate_animation = _evaluate_partial_pose
             self.duration = duration
             self.reverse = reverse
             self.reverse_on_each_loop = reverse_on_each_loop
 
             if transition:
-                for bone_name, bone in self.iter_bones():
+                for bone in self._bone_order:
                     bone.local_angle_saved = bone.local_angle
 
     def stop(self) -> None:
@@ -283,123 +489,76 @@ class SkeletalAnimation:
     def update(self) -> None:
         """ Update the skeletal animation. """
 
-        if not self.is_started:
-            return
-
-        now = perf_counter()
-        start_time = self.__transition_start_time if self.transition else self.__start_time
-        t0 = now - start_time
-        if not self.transition:
-            t0 *= self.time_scale
-        animation = self.animations[self.current_animation]
-
-        duration = self.transition_duration if self.transition else self.duration
-
-        if self.reverse:
-            t = duration - t0
-        else:
-            t = t0
-
-        #transition0_t = self.transition_t * self.old_time_scale
-        future_start_time = now - fmod(self.transition_duration, self.duration / self.time_scale)
-        future_t = now - future_start_time
-        future_t *= self.time_scale
-
-        transition1_t = future_t
-
-        #transition1_t = fmod(self.transition_duration, self.duration / self.time_scale)
-        t1_reversed = False
-        #if self.transition_reverse:
-        #    transition0_t = self.old_duration - transition0_t
-        #if (round(self.transition_duration / self.duration)-0) % 2 == 1:
-        #    transition1_t = self.duration*self.time_scale - transition1_t
-            #transition1_t = self.duration- transition1_t
-        #    t1_reversed = True
-
-        if t0 >= duration:
-            if self.transition:
-                self.transition = False
-                self.__start_time = perf_counter() - fmod(self.transition_duration, self.duration / self.time_scale)
-                self.reverse = t1_reversed
-
-                self.update()
+        self.invalidate()
 
-            elif self.is_looping:
-                self.__start_time = now
-
-                if self.reverse_on_each_loop:
-                    self.reverse = not self.reverse
+        # Finishing a transition or a loop restarts the timing, so this loops
+        # rather than calling update again
+        while self.is_started:
+            now = perf_counter_ns()
+            start_time = self.__transition_start_time if self.transition else self.__start_time
+            t0 = (now - start_time) * 1e-9
+            if not self.transition:
+                t0 *= self.time_scale
+            animation = self._animation
 
-                self.update()
+            duration = self.transition_duration if self.transition else self.duration
 
+            if self.reverse:
+                t = duration - t0
             else:
-                self.stop()
-            
-            return
-
-        for bone_animation in animation:
-            bone = bone_animation.bone
+                t = t0
 
+            #transition0_t = self.transition_t * self.old_time_scale
+            # Where the new animation will be once the transition is over
             if self.transition:
-                animation_prev = self.animations[self.previous_animation]
-                for bone_animation_prev in animation_prev:
-                    bone_prev = bone_animation_prev.bone
-                    if bone_prev.name == bone.name:
-                        break
+                transition1_ns = self._get_transition_offset()
+                transition1_t = transition1_ns * 1e-9 * self.time_scale
 
-                #a0k0, a0k1 = self._get_keyframes(bone_animation_prev.keyframes, transition0_t)
-                a1k0, a1k1 = self._get_keyframes(bone_animation.keyframes, transition1_t)
+            #transition1_t = fmod(self.transition_duration, self.duration / self.time_scale)
+            t1_reversed = False
+            #if self.transition_reverse:
+            #    transition0_t = self.old_duration - transition0_t
+            #if (round(self.transition_duration / self.duration)-0) % 2 == 1:
+            #    transition1_t = self.duration*self.time_scale - transition1_t
+                #transition1_t = self.duration- transition1_t
+            #    t1_reversed = True
 
-                #alpha0 = (transition0_t - a0k0.time) / (a0k1.time - a0k0.time)
-                #alpha0 = EASE_IN_OUT_SINE(alpha0)
-                #angle0 = lerp_angle(a0k0.angle, a0k1.angle, alpha0)
+            if t0 >= duration:
+                if self.transition:
+                    self.transition = False
+                    self.__start_time = now - transition1_ns
+                    self.reverse = t1_reversed
 
-                angle0 = bone.local_angle_saved
+                    continue
 
-                alpha1 = (transition1_t - a1k0.time) / (a1k1.time - a1k0.time)
-                alpha1 = EASE_IN_OUT_SINE(alpha1)
-                angle1 = lerp_angle(a1k0.angle, a1k1.angle, alpha1)
+                elif self.is_looping and self.duration > 0.0:
+                    self.__start_time = now
 
-                t = (now - start_time) / (self.transition_duration * 1.0)
-                t = EASE_IN_OUT_SINE(t)
+                    if self.reverse_on_each_loop:
+                        self.reverse = not self.reverse
 
-                bone.local_angle = lerp_angle(angle0, angle1, t)
-            else:
-                k0, k1 = self._get_keyframes(bone_animation.keyframes, t)
+                    continue
 
-                alpha = (t - k0.time) / (k1.time - k0.time)
-                alpha = EASE_IN_OUT_SINE(alpha)
+                else:
+                    self.stop()
+            
+                return
 
-                if k0.angle is not None and k1.angle is not None:
-                    bone.local_angle = lerp_angle(k0.angle, k1.angle, alpha)
+            if self.transition:
+                # Blend factor is the same for every bone
+                blend = EASE_IN_OUT_SINE(t0 / (self.transition_duration * 1.0))
 
-    def _get_keyframes(self,
-            keyframes: list[BoneAnimationKeyframe],
-            t: float
-            ) -> tuple[BoneAnimationKeyframe, BoneAnimationKeyframe]:
-        """ Get the nearest two keyframes around the current animation time """
+                _evaluate_transition_pose(animation, transition1_t, blend, self._flip_sign)
 
-        for i in range(len(keyframes) - 1):
-            k0, k1 = keyframes[i], keyframes[i + 1]
-            if k0.time <= t <= k1.time:
-                return k0, k1
+            else:
+                self._evaluate_animation(animation, t, self._flip_sign)
 
-        # Should never reach here
-        #raise Exception("HOW DID THE CODE REACH HERE")
+            return
 
-        return keyframes[-2], keyframes[-1]
-    
-    def _get_blending_keyframes(self,
-            keyframes_new: list[BoneAnimationKeyframe],
-            keyframes_old: list[BoneAnimationKeyframe],
-            t: float
-            ) -> tuple[BoneAnimationKeyframe, BoneAnimationKeyframe]:
-        
-        n = min(len(keyframes_old), len(keyframes_new))
+    def _get_transition_offset(self) -> int:
+        """ Get the time in nanoseconds the new animation has played after a transition. """
 
-        for i in range(n - 1):
-            k0, k1 = keyframes_old[i], keyframes_new[i + 1]
-            if k0.time <= t <= k1.time:
-                return k0, k1
-            
-        return keyframes_old[-2], keyframes_new[-1]
\ No newline at end of file
+        transition_ns = round(self.transition_duration * 1e9)
+        loop_ns = round(self.duration / self.time_scale * 1e9)
+
+        return transition_ns % loop_ns